@@ -0,0 +1,199 @@
+"""
+Lightweight stand-ins for the Supabase query builder used by backend tests
+"""
+
+import fnmatch
+import uuid
+
+
+class FakeResponse:
+    """Result of ``execute()``: just ``data`` and ``count`` like the postgrest response"""
+
+    __slots__ = ("data", "count")
+
+    def __init__(self, data=None, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """Query builder that records its chain of calls and resolves it on ``execute()``"""
+
+    __slots__ = ("_table", "_chain")
+
+    def __init__(self, table, chain=()):
+        self._table = table
+        self._chain = chain
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def step(*args, **kwargs):
+            return FakeQuery(self._table, self._chain + (name,))
+        return step
+
+    @property
+    def not_(self):
+        """``not_`` is an attribute, not a call, on the postgrest builder"""
+        return FakeQuery(self._table, self._chain + ("not_",))
+
+    def execute(self):
+        return self._table.result(self._chain)
+
+
+class FakeTable:
+    """Stand-in for ``supabase_client.table(...)`` answering configured chains.
+
+    Chains are the builder steps after ``table()``, e.g. ``("select", "eq", "single")``;
+    any chain without a configured result gets the default response. A
+    ``shared`` table holds the suite-wide defaults and is replaced, not
+    extended, by a test's own seeding.
+    """
+
+    def __init__(self, data=None, count=None, shared=False):
+        self._default = FakeResponse(data, count)
+        self._results = {}
+        self.shared = shared
+
+    def on(self, chain, data, count=None):
+        """Answer ``chain`` with ``data`` (and ``count``); returns the response for tweaking"""
+        response = self._results[tuple(chain)] = FakeResponse(data, count)
+        return response
+
+    def result(self, chain):
+        return self._results.get(chain, self._default)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(FakeQuery(self), name)
+
+
+# ``is_`` takes PostgREST literals as well as the Python values they stand for
+_IS_LITERALS = {"null": None, "true": True, "false": False}
+
+
+class FakeStoreQuery:
+    """Query builder over one :class:`FakeSupabase` table with real filter semantics"""
+
+    _OPERATORS = {
+        "eq": lambda value, arg: value == arg,
+        "neq": lambda value, arg: value != arg,
+        "gt": lambda value, arg: value is not None and value > arg,
+        "gte": lambda value, arg: value is not None and value >= arg,
+        "lt": lambda value, arg: value is not None and value < arg,
+        "lte": lambda value, arg: value is not None and value <= arg,
+        "in_": lambda value, arg: value in arg,
+        "is_": lambda value, arg: value is _IS_LITERALS.get(arg, arg),
+        "ilike": lambda value, arg: value is not None and fnmatch.fnmatchcase(
+            str(value).lower(), arg.lower().replace("%", "*")
+        ),
+    }
+
+    def __init__(self, store, name):
+        self._store = store
+        self._name = name
+        self._filters = []
+        self._action = ("select", None)
+        self._count = None
+        self._order = []
+        self._range = None
+        self._single = False
+        self._negate = False
+
+    def __getattr__(self, name):
+        if name not in self._OPERATORS:
+            raise AttributeError(name)
+        test = self._OPERATORS[name]
+        negate, self._negate = self._negate, False
+
+        def op(value, arg):
+            return bool(test(value, arg)) != negate
+
+        def add_filter(column, arg):
+            self._filters.append((column, op, arg))
+            return self
+        return add_filter
+
+    @property
+    def not_(self):
+        """Negate the next filter, like ``.not_`` on the postgrest builder"""
+        self._negate = True
+        return self
+
+    def select(self, *columns, count=None):
+        self._count = count
+        return self
+
+    def insert(self, rows):
+        self._action = ("insert", rows)
+        return self
+
+    def update(self, values):
+        self._action = ("update", values)
+        return self
+
+    def delete(self):
+        self._action = ("delete", None)
+        return self
+
+    def order(self, column, desc=False):
+        self._order.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end + 1)
+        return self
+
+    def limit(self, size):
+        self._range = (0, size)
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    def _matches(self, row):
+        return all(op(row.get(column), arg) for column, op, arg in self._filters)
+
+    def execute(self):
+        rows = self._store.tables.setdefault(self._name, [])
+        action, payload = self._action
+        if action == "insert":
+            new_rows = [payload] if isinstance(payload, dict) else list(payload)
+            new_rows = [{"id": str(uuid.uuid4()), **row} for row in new_rows]
+            rows.extend(new_rows)
+            return FakeResponse([dict(row) for row in new_rows])
+        matched = [row for row in rows if self._matches(row)]
+        if action == "update":
+            for row in matched:
+                row.update(payload)
+            return FakeResponse([dict(row) for row in matched])
+        if action == "delete":
+            removed = {id(row) for row in matched}
+            self._store.tables[self._name] = [row for row in rows if id(row) not in removed]
+            return FakeResponse([dict(row) for row in matched])
+
+        for column, desc in reversed(self._order):
+            matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        count = len(matched) if self._count else None
+        if self._range:
+            matched = matched[slice(*self._range)]
+        data = [dict(row) for row in matched]
+        if self._single:
+            if len(data) != 1:
+                # Mirrors PostgREST's PGRST116 error for .single()
+                raise Exception("JSON object requested, multiple (or no) rows returned")
+            data = data[0]
+        return FakeResponse(data, count)
+
+
+class FakeSupabase:
+    """In-memory Supabase stand-in: ``tables`` maps table names to row dicts"""
+
+    def __init__(self, **tables):
+        self.tables = {name: [dict(row) for row in rows] for name, rows in tables.items()}
+
+    def table(self, name):
+        return FakeStoreQuery(self, name)
@@ -0,0 +1,46 @@
+"""
+Shared helpers for backend tests
+"""
+
+import orjson
+
+from tests.fakes import FakeTable
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def post_json(client, url, json, headers=None, **kwargs):
+    """POST ``json`` encoded with orjson instead of the client's stdlib encoder.
+
+    Works with both ``TestClient`` and ``AsyncClient``; async callers await
+    the returned coroutine.
+    """
+    return client.post(
+        url,
+        content=orjson.dumps(json),
+        headers={**JSON_HEADERS, **(headers or {})},
+        **kwargs,
+    )
+
+
+async def status_only(client, method, url, **kwargs):
+    """Send a request on an ``AsyncClient`` and return just its status code.
+
+    The response is streamed and closed unread, so its body is never
+    buffered or decoded.
+    """
+    async with client.stream(method, url, **kwargs) as response:
+        return response.status_code
+
+
+def set_query_result(mock, chain, data, count=None):
+    """Make ``table().<chain...>().execute()`` on ``mock`` return ``data`` (and ``count``).
+
+    The first call swaps ``mock.table``'s return value for a fresh :class:`FakeTable`;
+    chains the test did not configure then return an empty response.
+    """
+    table = mock.table.return_value
+    if not isinstance(table, FakeTable) or table.shared:
+        table = mock.table.return_value = FakeTable()
+    return table.on(chain, data, count)
@@ -3,129 +3,29 @@ Comprehensive tests for Assessments service and endpoints
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
 from fastapi import status
-import uuid
 
 
-class TestAssessmentEndpoints:
-    """Tests for assessment endpoints"""
-
-    def test_list_assessments_for_course(self, client, mock_assessments, mock_supabase_client):
-        """Test listing assessments for a course"""
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = mock_assessments
-
-        response = client.get("/api/v1/courses/course1/assessments")
-
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert isinstance(data, list)
-
-    def test_get_assessment_detail(self, client, mock_assessment, mock_supabase_client):
-        """Test retrieving assessment details"""
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = mock_assessment
-
-        response = client.get(f"/api/v1/assessments/{mock_assessment['id']}")
-
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("id") == mock_assessment["id"]
-
-    def test_submit_assessment_answer(self, client, auth_headers, mock_supabase_client):
-        """Test submitting assessment answers"""
-        submission_data = {
-            "assessment_id": "assessment1",
-            "answers": {
-                "q1": "answer1",
-                "q2": "answer2"
-            }
-        }
-
-        result_data = {
-            "id": str(uuid.uuid4()),
-            "assessment_id": submission_data["assessment_id"],
-            "user_id": "user1",
-            "score": 85,
-            "status": "submitted"
-        }
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-        mock_supabase_client.table.return_value.insert.return_value.execute.return_value.data = [result_data]
+# The assessments router (app/api/v1/endpoints/assessments.py) defines no routes
+# yet, and the courses router has no assessments listing
+ASSESSMENT_ROUTES = [
+    pytest.param("GET", "/api/v1/courses/course1/assessments", id="list_assessments_for_course"),
+    pytest.param("GET", "/api/v1/assessments/assessment1", id="get_assessment_detail"),
+    pytest.param("POST", "/api/v1/assessments/submit", id="submit_assessment_answer"),
+    pytest.param("GET", "/api/v1/assessments/result1", id="get_assessment_result"),
+    pytest.param("POST", "/api/v1/assessments", id="create_assessment"),
+]
 
-        response = client.post(
-            "/api/v1/assessments/submit",
-            headers=auth_headers,
-            json=submission_data
-        )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_201_CREATED,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("score") is not None
-
-    def test_get_assessment_result(self, client, auth_headers, mock_supabase_client):
-        """Test retrieving assessment result"""
-        result_data = {
-            "id": "result1",
-            "assessment_id": "assessment1",
-            "user_id": "user1",
-            "score": 85,
-            "status": "graded"
-        }
-
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = result_data
-
-        response = client.get(
-            "/api/v1/assessments/result1",
-            headers=auth_headers
-        )
-
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("score") is not None
-
-    def test_create_assessment(self, client, auth_headers, mock_supabase_client):
-        """Test creating an assessment"""
-        assessment_data = {
-            "course_id": "course1",
-            "title": "Quiz 1",
-            "questions": [
-                {"question": "Q1", "type": "multiple_choice", "options": ["A", "B", "C"]},
-                {"question": "Q2", "type": "short_answer"}
-            ]
-        }
-
-        new_assessment = {
-            **assessment_data,
-            "id": str(uuid.uuid4())
-        }
-
-        mock_supabase_client.table.return_value.insert.return_value.execute.return_value.data = [new_assessment]
+class TestAssessmentEndpoints:
+    """Tests for assessment endpoints"""
 
-        response = client.post(
-            "/api/v1/assessments",
-            headers=auth_headers,
-            json=assessment_data
-        )
+    @pytest.mark.parametrize("method,path", ASSESSMENT_ROUTES)
+    async def test_assessment_endpoint(self, async_client, auth_headers, method, path):
+        """Test each planned assessment endpoint"""
+        response = await async_client.request(method, path, headers=auth_headers)
 
-        assert response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        # Expected 404 since endpoint not implemented
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -3,18 +3,21 @@ Comprehensive tests for Authentication service and endpoints
 """
 
 import pytest
-from unittest.mock import MagicMock, AsyncMock, patch
 from fastapi import status
-import uuid
-from datetime import datetime
+
+from tests.helpers import post_json
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
 class TestAuthEndpoints:
     """Tests for authentication endpoints"""
 
-    def test_register_success(self, client, mock_supabase_client, mock_supabase_admin):
+    async def test_register_success(self, async_client, mock_supabase_client, mock_supabase_admin):
         """Test successful user registration"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/register",
             json={
                 "email": "newuser@example.com",
@@ -28,16 +31,16 @@ class TestAuthEndpoints:
         # Accept 201 or 400 (validation error from phone/data)
         assert response.status_code in [status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST, status.HTTP_500_INTERNAL_SERVER_ERROR]
         if response.status_code == status.HTTP_201_CREATED:
-            if response.status_code < 400:
-                data = response.json()
-                assert "access_token" in data
-                assert "refresh_token" in data
-                if response.status_code < 400: assert data.get("token_type") == "bearer"
-                assert "user" in data
+            data = response.json()
+            assert "access_token" in data
+            assert "refresh_token" in data
+            assert data.get("token_type") == "bearer"
+            assert "user" in data
 
-    def test_register_email_already_exists(self, client, mock_supabase_client):
+    async def test_register_email_already_exists(self, async_client, mock_supabase_client):
         """Test registration fails if email already exists"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/register",
             json={
                 "email": "testuser@example.com",  # Use existing email from mock
@@ -50,79 +53,32 @@ class TestAuthEndpoints:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "already registered" in response.json()["detail"].lower()
 
-    def test_register_invalid_email(self, client):
-        """Test registration fails with invalid email"""
-        response = client.post(
-            "/api/v1/auth/register",
-            json={
-                "email": "invalid-email",
-                "password": "SecurePass123",
-                "full_name": "Test User",
-                "role": "student"
-            }
-        )
-
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-
-    def test_register_weak_password(self, client):
-        """Test registration fails with weak password"""
-        response = client.post(
-            "/api/v1/auth/register",
-            json={
-                "email": "test@example.com",
-                "password": "weakpass",  # No uppercase, no digit
-                "full_name": "Test User",
-                "role": "student"
-            }
-        )
-
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-
-    def test_register_short_password(self, client):
-        """Test registration fails with password < 8 characters"""
-        response = client.post(
-            "/api/v1/auth/register",
-            json={
-                "email": "test@example.com",
-                "password": "Pass1",  # Only 5 characters
-                "full_name": "Test User",
-                "role": "student"
-            }
-        )
-
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param({"email": "invalid-email"}, id="invalid_email"),
+            pytest.param({"password": "weakpass"}, id="weak_password"),  # No uppercase, no digit
+            pytest.param({"password": "Pass1"}, id="short_password"),  # Only 5 characters
+            pytest.param({"phone": "invalid-phone"}, id="invalid_phone"),
+        ],
+    )
+    async def test_register_validation_errors(self, async_client, payload):
+        """Test registration fails request validation for malformed fields"""
+        base = {
+            "email": "test@example.com",
+            "password": "SecurePass123",
+            "full_name": "Test User",
+            "role": "student"
+        }
 
-    def test_register_invalid_phone(self, client):
-        """Test registration fails with invalid phone number"""
-        response = client.post(
-            "/api/v1/auth/register",
-            json={
-                "email": "test@example.com",
-                "password": "SecurePass123",
-                "full_name": "Test User",
-                "phone": "invalid-phone",
-                "role": "student"
-            }
-        )
+        response = await post_json(async_client, "/api/v1/auth/register", json={**base, **payload})
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-    def test_login_success(self, client, mock_supabase_client, mock_supabase_admin):
-        """Test successful login"""
-        mock_user_data = {
-            "id": str(uuid.uuid4()),
-            "email": "test@example.com",
-            "role": "student",
-            "is_active": True
-        }
-
-        mock_supabase_admin.auth.admin.get_user_by_email.return_value.user.id = mock_user_data["id"]
-        
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = mock_user_data
-        
-    def test_login_success(self, client, mock_supabase_client):
+    async def test_login_success(self, async_client, mock_supabase_client):
         """Test successful login"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/login",
             json={
                 "email": "testuser@example.com",
@@ -133,14 +89,14 @@ class TestAuthEndpoints:
         # Should succeed with mock data
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_401_UNAUTHORIZED]
         if response.status_code == status.HTTP_200_OK:
-            if response.status_code < 400:
-                data = response.json()
-                assert "access_token" in data
-                assert "refresh_token" in data
+            data = response.json()
+            assert "access_token" in data
+            assert "refresh_token" in data
 
-    def test_login_invalid_credentials(self, client):
+    async def test_login_invalid_credentials(self, async_client):
         """Test login fails with invalid credentials"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/login",
             json={
                 "email": "nonexistent@example.com",
@@ -150,9 +106,10 @@ class TestAuthEndpoints:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_login_inactive_user(self, client):
+    async def test_login_inactive_user(self, async_client):
         """Test login fails for inactive user"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/login",
             json={
                 "email": "inactive@example.com",
@@ -163,49 +120,52 @@ class TestAuthEndpoints:
         # Should fail as user not in mock data
         assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
 
-    def test_refresh_token(self, client, mock_supabase_client, mock_user, auth_headers):
+    async def test_refresh_token(self, async_client, mock_supabase_client, mock_user, auth_headers):
         """Test token refresh"""
         from app.core.security import create_refresh_token
         
         try:
             refresh_token = create_refresh_token({"sub": mock_user["id"]})
 
-            response = client.post(
+            response = await post_json(
+                async_client,
                 "/api/v1/auth/refresh",
                 json={"refresh_token": refresh_token}
             )
 
             assert response.status_code in [status.HTTP_200_OK, status.HTTP_401_UNAUTHORIZED, status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR]
             if response.status_code == status.HTTP_200_OK:
-                if response.status_code < 400:
-                    data = response.json()
-                    assert "access_token" in data
+                data = response.json()
+                assert "access_token" in data
         except Exception:
             # Handle mock data errors gracefully
             pass
 
-    def test_verify_email(self, client):
+    async def test_verify_email(self, async_client):
         """Test email verification"""
         # Endpoint doesn't exist yet - skip
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/verify-email",
             json={"token": "valid-token"}
         )
         # Expected 404 since endpoint not implemented
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
-    def test_request_password_reset(self, client):
+    async def test_request_password_reset(self, async_client):
         """Test password reset request"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/password-reset",
             json={"email": "test@example.com"}
         )
         # Endpoint returns success regardless
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_422_UNPROCESSABLE_ENTITY]
 
-    def test_confirm_password_reset(self, client):
+    async def test_confirm_password_reset(self, async_client):
         """Test password reset confirmation"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/password-reset/confirm",
             json={
                 "token": "valid-token",
@@ -215,31 +175,31 @@ class TestAuthEndpoints:
         # Endpoint exists, check valid response
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST, status.HTTP_404_NOT_FOUND]
 
-    def test_logout(self, client, auth_headers):
+    async def test_logout(self, async_client, auth_headers):
         """Test user logout"""
-        response = client.post("/api/v1/auth/logout", headers=auth_headers)
+        response = await async_client.post("/api/v1/auth/logout", headers=auth_headers)
 
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_204_NO_CONTENT, status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR]
 
-    def test_get_current_user(self, client, auth_headers):
+    async def test_get_current_user(self, async_client, auth_headers):
         """Test retrieving current user"""
-        response = client.get("/api/v1/auth/me", headers=auth_headers)
+        response = await async_client.get("/api/v1/auth/me", headers=auth_headers)
 
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_500_INTERNAL_SERVER_ERROR]
         if response.status_code == status.HTTP_200_OK:
-            if response.status_code < 400:
-                data = response.json()
-                assert "email" in data
+            data = response.json()
+            assert "email" in data
 
-    def test_get_current_user_unauthorized(self, client):
+    async def test_get_current_user_unauthorized(self, async_client):
         """Test retrieving current user without auth"""
-        response = client.get("/api/v1/auth/me")
+        response = await async_client.get("/api/v1/auth/me")
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
-    def test_change_password(self, client, auth_headers):
+    async def test_change_password(self, async_client, auth_headers):
         """Test changing password"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/change-password",
             headers=auth_headers,
             json={
@@ -251,9 +211,10 @@ class TestAuthEndpoints:
         # Endpoint doesn't exist - expect 404
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND, status.HTTP_422_UNPROCESSABLE_ENTITY]
 
-    def test_change_password_wrong_current(self, client, auth_headers):
+    async def test_change_password_wrong_current(self, async_client, auth_headers):
         """Test changing password fails with wrong current password"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/change-password",
             headers=auth_headers,
             json={
@@ -268,9 +229,10 @@ class TestAuthEndpoints:
 class TestGoogleAuth:
     """Tests for Google OAuth authentication"""
 
-    def test_google_auth_success(self, client):
+    async def test_google_auth_success(self, async_client):
         """Test successful Google authentication"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/google",
             json={"token": "valid-google-token"}
         )
@@ -282,9 +244,10 @@ class TestGoogleAuth:
 class TestPhoneAuth:
     """Tests for Phone OTP authentication"""
 
-    def test_request_otp(self, client):
+    async def test_request_otp(self, async_client):
         """Test OTP request"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/request-otp",
             json={"phone": "+919876543210"}
         )
@@ -292,9 +255,10 @@ class TestPhoneAuth:
         # Endpoint doesn't exist yet
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND, status.HTTP_422_UNPROCESSABLE_ENTITY]
 
-    def test_verify_otp(self, client):
+    async def test_verify_otp(self, async_client):
         """Test OTP verification"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/verify-otp",
             json={"phone": "+919876543210", "otp": "123456"}
         )
@@ -302,9 +266,10 @@ class TestPhoneAuth:
         # Endpoint doesn't exist yet
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND, status.HTTP_422_UNPROCESSABLE_ENTITY]
 
-    def test_verify_otp_invalid(self, client):
+    async def test_verify_otp_invalid(self, async_client):
         """Test OTP verification with invalid OTP"""
-        response = client.post(
+        response = await post_json(
+            async_client,
             "/api/v1/auth/verify-otp",
             json={"phone": "+919876543210", "otp": "000000"}
         )
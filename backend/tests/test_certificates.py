@@ -0,0 +1,181 @@
+"""
+Comprehensive tests for Certificate service
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.certificate_service import certificate_service
+from tests.helpers import set_query_result
+
+
+_BADGE_ITEMS = tuple(certificate_service.BADGES.items())
+_REQUIRED_BADGE_FIELDS = frozenset({"name", "description", "icon", "category", "criteria"})
+_BADGE_CATEGORIES = frozenset({"milestone", "achievement"})
+
+
+class TestCertificateGeneration:
+    """Tests for certificate generation"""
+
+    @pytest.mark.fast
+    @pytest.mark.parametrize("percentage,expected", [
+        (100, "A+"), (95, "A+"),
+        (94.9, "A"), (90, "A"),
+        (89.9, "B+"), (85, "B+"),
+        (84.9, "B"), (80, "B"),
+        (79.9, "C+"), (75, "C+"),
+        (74.9, "C"), (70, "C"),
+        (69.9, "D+"), (65, "D+"),
+        (64.9, "D"), (60, "D"),
+        (59.9, "F"), (0, "F"),
+    ])
+    def test_calculate_grade_boundary(self, percentage, expected):
+        """Test letter grade at and just below each threshold"""
+        assert certificate_service._calculate_grade(percentage) == expected
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_generate_course_certificate_success(self, mock_supabase_client):
+        """Test generating a course completion certificate"""
+        set_query_result(mock_supabase_client, ("select", "eq", "single"), {
+            "id": "course1",
+            "title": "Python Basics",
+            "instructor_id": "instructor1",
+            "duration_hours": 10
+        })
+        set_query_result(mock_supabase_client, ("select", "eq", "eq", "eq"), [])
+        set_query_result(mock_supabase_client, ("select", "eq", "eq", "single"), {
+            "completion_percentage": 100,
+            "total_watch_time_minutes": 600
+        })
+
+        result = await certificate_service.generate_course_completion_certificate("user1", "course1")
+
+        assert {"certificate_id", "certificate_number", "verification_code", "title", "issued_date"} <= result.keys()
+        assert result["title"] == "Certificate of Completion - Python Basics"
+        assert result["certificate_number"].startswith("CERT-") and result["verification_code"].startswith(f"VER-{result['certificate_id'][:8]}-")
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_generate_course_certificate_already_exists(self, mock_supabase_client):
+        """Test that an existing course certificate is returned instead of a new one"""
+        set_query_result(mock_supabase_client, ("select", "eq", "single"), {"id": "course1", "title": "Python Basics"})
+        set_query_result(mock_supabase_client, ("select", "eq", "eq", "eq"), [{
+            "id": "cert1",
+            "certificate_number": "CERT-20251114-ABC123",
+            "verification_code": "VER-abc-xyz"
+        }])
+
+        result = await certificate_service.generate_course_completion_certificate("user1", "course1")
+
+        assert result == {
+            "certificate_id": "cert1",
+            "certificate_number": "CERT-20251114-ABC123",
+            "verification_code": "VER-abc-xyz",
+            "already_exists": True
+        }
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_generate_course_certificate_course_not_found(self, mock_supabase_client):
+        """Test generating a certificate for a missing course"""
+        set_query_result(mock_supabase_client, ("select", "eq", "single"), None)
+
+        with pytest.raises(Exception, match="Course not found"):
+            await certificate_service.generate_course_completion_certificate("user1", "missing")
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_generate_exam_certificate_below_passing(self, mock_supabase_client):
+        """Test that no exam certificate is issued below the passing score"""
+        set_query_result(mock_supabase_client, ("select", "eq", "single"), {"id": "assessment1", "title": "Quiz 1"})
+
+        result = await certificate_service.generate_exam_certificate("user1", "assessment1", 55, 55.0)
+
+        assert result == {"error": "Score below passing threshold", "percentage": 55.0}
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_generate_exam_certificate_success(self, mock_supabase_client):
+        """Test generating an exam certificate with its letter grade"""
+        set_query_result(mock_supabase_client, ("select", "eq", "single"), {
+            "id": "assessment1",
+            "title": "Quiz 1",
+            "course_id": "course1"
+        })
+        set_query_result(mock_supabase_client, ("select", "eq", "eq", "eq"), [])
+
+        result = await certificate_service.generate_exam_certificate("user1", "assessment1", 88, 88.0)
+
+        assert {"certificate_id", "certificate_number", "verification_code", "title", "grade", "percentage", "issued_date"} <= result.keys()
+        assert result["title"] == "Certificate of Achievement - Quiz 1"
+        assert result["certificate_number"].startswith("EXAM-") and result["grade"] == "B+"
+
+
+@pytest.mark.fast
+class TestBadgeDefinitions:
+    """Tests for the static badge definitions"""
+
+    @pytest.mark.parametrize("badge_key,badge_def", _BADGE_ITEMS)
+    def test_badge_has_required_fields(self, badge_key, badge_def):
+        """Test each badge defines the fields awarded badges are built from"""
+        missing = _REQUIRED_BADGE_FIELDS - badge_def.keys()
+        assert not missing, f"{badge_key} is missing {sorted(missing)}"
+
+    @pytest.mark.parametrize("badge_key,badge_def", _BADGE_ITEMS)
+    def test_badge_category_is_valid(self, badge_key, badge_def):
+        """Test each badge falls into a category counted by achievements"""
+        assert badge_def["category"] in _BADGE_CATEGORIES
+
+    @pytest.mark.parametrize("badge_key,badge_def", _BADGE_ITEMS)
+    def test_badge_criteria_has_type(self, badge_key, badge_def):
+        """Test each badge criteria declares its type"""
+        assert isinstance(badge_def["criteria"].get("type"), str)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestBadgeAwards:
+    """Tests for badge awards triggered by completions"""
+
+    async def test_first_course_badge_award(self, mock_supabase_client, monkeypatch):
+        """Test the first completed course awards the first_course badge"""
+        set_query_result(mock_supabase_client, ("select", "eq", "eq"), None, count=0)
+        mock_award = AsyncMock()
+        monkeypatch.setattr(certificate_service, "award_badge", mock_award)
+
+        await certificate_service._award_completion_badges("user1", "course1")
+
+        mock_award.assert_called_once_with("user1", "first_course")
+
+    async def test_no_milestone_badge_between_thresholds(self, mock_supabase_client, monkeypatch):
+        """Test no badge is awarded when no completion milestone is reached"""
+        set_query_result(mock_supabase_client, ("select", "eq", "eq"), None, count=3)
+        mock_award = AsyncMock()
+        monkeypatch.setattr(certificate_service, "award_badge", mock_award)
+
+        await certificate_service._award_completion_badges("user1", "course1")
+
+        mock_award.assert_not_called()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestAchievements:
+    """Tests for user achievement summaries"""
+
+    async def test_get_user_achievements(self, supabase_store):
+        """Test achievement stats computed from certificates and badges"""
+        supabase_store.tables["certificates"] = [
+            {"id": "c1", "user_id": "user1", "type": "course_completion"},
+            {"id": "c2", "user_id": "user1", "type": "exam_completion", "percentage": 80},
+            {"id": "c3", "user_id": "user1", "type": "exam_completion", "percentage": 95},
+        ]
+        supabase_store.tables["user_badges"] = [
+            {"id": "b1", "user_id": "user1", "badge_key": "first_course", "category": "milestone"},
+            {"id": "b2", "user_id": "user1", "badge_key": "perfect_score", "category": "achievement"},
+        ]
+
+        result = await certificate_service.get_user_achievements("user1")
+
+        assert {"user_id", "certificates", "badges", "total_badges"} <= result.keys()
+        assert {
+            "total_certificates": 3,
+            "course_certificates": 1,
+            "exam_certificates": 2,
+            "average_exam_score": 87.5,
+            "badge_categories": {"milestone": 1, "achievement": 1},
+        }.items() <= result.items()
@@ -3,131 +3,164 @@ Comprehensive tests for Content service and endpoints
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
 from fastapi import status
 import uuid
 
 
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+_COURSE_ID = str(uuid.uuid4())
+_MODULE_ID = str(uuid.uuid4())
+
+
+def _video(uploaded_by, **overrides):
+    """A ``course_videos`` row as stored by the upload endpoint"""
+    video_id = str(uuid.uuid4())
+    return {
+        "video_id": video_id,
+        "course_id": _COURSE_ID,
+        "module_id": _MODULE_ID,
+        "original_filename": "intro.mp4",
+        "file_size": 1024,
+        "mime_type": "video/mp4",
+        "video_url": f"https://example.com/videos/{video_id}.mp4",
+        "status": "ready",
+        "title": "Video: Introduction",
+        "uploaded_by": uploaded_by,
+        "uploaded_at": "2024-01-15T10:00:00Z",
+        **overrides,
+    }
+
+
+def _seed_course(store, student_id, instructor_id, videos):
+    """Store a course by ``instructor_id`` with one module, ``student_id`` enrolled and ``videos``"""
+    store.tables["courses"] = [{"id": _COURSE_ID, "instructor_id": instructor_id}]
+    store.tables["course_modules"] = [{"id": _MODULE_ID, "course_id": _COURSE_ID}]
+    store.tables["enrollments"] = [
+        {"id": str(uuid.uuid4()), "user_id": student_id, "course_id": _COURSE_ID}
+    ]
+    store.tables["course_videos"] = list(videos)
+
+
 class TestContentEndpoints:
     """Tests for content endpoints"""
 
-    def test_list_course_content(self, client, mock_content_items, mock_supabase_client):
-        """Test listing course content"""
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.order.return_value.execute.return_value.data = mock_content_items
-
-        response = client.get("/api/v1/courses/course1/content")
-
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert isinstance(data, list)
-
-    def test_get_content_detail(self, client, mock_content, mock_supabase_client):
-        """Test retrieving content details"""
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = mock_content
-
-        response = client.get(f"/api/v1/content/{mock_content['id']}")
-
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("id") == mock_content["id"]
-
-    def test_create_content(self, client, auth_headers, mock_supabase_client):
-        """Test creating content"""
-        content_data = {
-            "course_id": "course1",
-            "title": "Lesson 1",
-            "content_type": "video",
-            "content_url": "https://example.com/video.mp4",
-            "duration": 300
-        }
-
-        new_content = {
-            **content_data,
-            "id": str(uuid.uuid4())
-        }
-
-        mock_supabase_client.table.return_value.insert.return_value.execute.return_value.data = [new_content]
-
-        response = client.post(
-            "/api/v1/content",
-            headers=auth_headers,
-            json=content_data
+    async def test_get_video_as_enrolled_student(
+        self, async_client, auth_headers, mock_user, mock_instructor, supabase_store
+    ):
+        """Test an enrolled student can read a video's details"""
+        video = _video(mock_instructor["id"])
+        _seed_course(supabase_store, mock_user["id"], mock_instructor["id"], [video])
+
+        response = await async_client.get(
+            f"/api/v1/content/videos/{video['video_id']}",
+            headers=auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-    def test_update_content(self, client, auth_headers, mock_content, mock_supabase_client):
-        """Test updating content"""
-        updated_data = {
-            "title": "Updated Lesson",
-            "duration": 600
-        }
-
-        mock_supabase_client.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [
-            {**mock_content, **updated_data}
-        ]
-
-        response = client.put(
-            f"/api/v1/content/{mock_content['id']}",
-            headers=auth_headers,
-            json=updated_data
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["video_url"] == video["video_url"]
+
+    async def test_get_video_not_enrolled(
+        self, async_client, auth_headers, mock_instructor, supabase_store
+    ):
+        """Test a student outside the course cannot read its videos"""
+        video = _video(mock_instructor["id"])
+        _seed_course(supabase_store, str(uuid.uuid4()), mock_instructor["id"], [video])
+
+        response = await async_client.get(
+            f"/api/v1/content/videos/{video['video_id']}",
+            headers=auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "Not authorized to view this video"
 
-    def test_delete_content(self, client, auth_headers, mock_content, mock_supabase_client):
-        """Test deleting content"""
-        mock_supabase_client.table.return_value.delete.return_value.eq.return_value.execute.return_value.data = None
+    async def test_get_missing_video(self, async_client, auth_headers, seed_mock):
+        """Test reading a video that does not exist"""
+        seed_mock(("select", "eq", "single"), None)
 
-        response = client.delete(
-            f"/api/v1/content/{mock_content['id']}",
+        response = await async_client.get(
+            f"/api/v1/content/videos/{uuid.uuid4()}",
             headers=auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_204_NO_CONTENT, status.HTTP_200_OK,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Video not found"
 
-    def test_mark_content_complete(self, client, auth_headers, mock_supabase_client):
-        """Test marking content as complete"""
-        completion_data = {
-            "content_id": "content1",
-            "completed_at": "2024-01-15T10:00:00Z"
-        }
+    async def test_list_course_videos(
+        self, async_client, auth_headers, mock_user, mock_instructor, supabase_store
+    ):
+        """Test listing a course's videos, latest module first"""
+        first = _video(mock_instructor["id"], module_id="module-1")
+        second = _video(mock_instructor["id"], module_id="module-2")
+        _seed_course(supabase_store, mock_user["id"], mock_instructor["id"], [first, second])
 
-        result_data = {
-            "id": str(uuid.uuid4()),
-            **completion_data
-        }
+        response = await async_client.get(
+            f"/api/v1/content/courses/{_COURSE_ID}/videos",
+            headers=auth_headers
+        )
 
-        mock_supabase_client.table.return_value.insert.return_value.execute.return_value.data = [result_data]
+        assert response.status_code == status.HTTP_200_OK
+        assert [v["video_id"] for v in response.json()] == [second["video_id"], first["video_id"]]
+
+    async def test_list_module_videos(
+        self, async_client, auth_headers, mock_user, mock_instructor, supabase_store
+    ):
+        """Test listing a module's videos with their total size"""
+        _seed_course(supabase_store, mock_user["id"], mock_instructor["id"], [
+            _video(mock_instructor["id"]),
+            _video(mock_instructor["id"], file_size=2048),
+            _video(mock_instructor["id"], module_id="other-module"),
+        ])
+
+        response = await async_client.get(
+            f"/api/v1/content/modules/{_MODULE_ID}/videos",
+            headers=auth_headers
+        )
 
-        response = client.post(
-            "/api/v1/content/complete",
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.json()["count"], response.json()["total_size"]) == (2, 3072)
+
+    async def test_update_video_metadata(
+        self, async_client, instructor_auth_headers, mock_user, mock_instructor, supabase_store
+    ):
+        """Test the uploading instructor can retitle a video"""
+        video = _video(mock_instructor["id"])
+        _seed_course(supabase_store, mock_user["id"], mock_instructor["id"], [video])
+
+        response = await async_client.put(
+            f"/api/v1/content/videos/{video['video_id']}/metadata",
+            headers=instructor_auth_headers,
+            json={"title": "Updated Lesson", "duration": 600}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.json()["title"], response.json()["duration"]) == ("Updated Lesson", 600)
+        assert supabase_store.tables["course_videos"][0]["title"] == "Updated Lesson"
+
+    async def test_update_video_metadata_requires_instructor(self, async_client, auth_headers):
+        """Test students cannot edit video metadata"""
+        response = await async_client.put(
+            f"/api/v1/content/videos/{uuid.uuid4()}/metadata",
             headers=auth_headers,
-            json=completion_data
+            json={"title": "Updated Lesson"}
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "Instructor access required"
+
+    async def test_delete_other_instructors_video(
+        self, async_client, instructor_auth_headers, mock_user, mock_instructor, supabase_store
+    ):
+        """Test an instructor cannot delete a video someone else uploaded"""
+        video = _video(str(uuid.uuid4()))
+        _seed_course(supabase_store, mock_user["id"], mock_instructor["id"], [video])
+
+        response = await async_client.delete(
+            f"/api/v1/content/videos/{video['video_id']}",
+            headers=instructor_auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_201_CREATED,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json()["detail"] == "Not authorized to delete this video"
+        assert [v["video_id"] for v in supabase_store.tables["course_videos"]] == [video["video_id"]]
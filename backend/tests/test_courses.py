@@ -2,140 +2,120 @@
 Comprehensive tests for Courses service and endpoints
 """
 
-import pytest
-from unittest.mock import MagicMock, patch
 from fastapi import status
-import uuid
-from datetime import datetime
 
 
 class TestCourseEndpoints:
     """Tests for course endpoints"""
 
-    def test_list_courses(self, client, auth_headers, mock_courses, mock_supabase_client):
+    def test_list_courses(self, client, auth_headers, mock_courses, seed_mock):
         """Test listing all courses"""
-        mock_supabase_client.table.return_value.select.return_value.range.return_value.order.return_value.execute.return_value.data = mock_courses
-        mock_supabase_client.table.return_value.select.return_value.range.return_value.order.return_value.execute.return_value.count = len(mock_courses)
+        # Students only see published courses: select().eq("is_published").range().order()
+        seed_mock(("select", "eq", "range", "order"), mock_courses, count=len(mock_courses))
 
         response = client.get(
             "/api/v1/courses",
             headers=auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert isinstance(data, dict) or isinstance(data, list)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == len(mock_courses)
+        assert [c["id"] for c in data["courses"]] == [c["id"] for c in mock_courses]
 
-    def test_get_course_detail(self, client, auth_headers, mock_course, mock_supabase_client):
+    def test_get_course_detail(self, client, auth_headers, mock_course, seed_mock):
         """Test retrieving course details"""
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = mock_course
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.order.return_value.execute.return_value.data = []
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value.count = 0
+        seed_mock(("select", "eq", "single"), mock_course)
+        seed_mock(("select", "eq", "order"), [])
+        seed_mock(("select", "eq", "eq"), [], count=0)
 
         response = client.get(
             f"/api/v1/courses/{mock_course['id']}",
             headers=auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("id") == mock_course["id"]
-            assert data.get("title") == mock_course["title"]
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["id"] == mock_course["id"]
+        assert data["title"] == mock_course["title"]
+        assert data["total_students"] == 0
 
-    def test_create_course(self, client, auth_headers, mock_supabase_client):
+    def test_create_course(self, client, instructor_auth_headers, mock_instructor, mock_course, seed_mock):
         """Test creating a new course"""
         course_data = {
             "title": "New Course",
-            "description": "Course description",
-            "instructor_id": "instructor1",
-            "category": "programming"
+            "description": "Course description"
         }
 
-        new_course = {**course_data, "id": str(uuid.uuid4())}
-        mock_supabase_client.table.return_value.insert.return_value.execute.return_value.data = [new_course]
+        new_course = {**mock_course, **course_data, "instructor_id": mock_instructor["id"]}
+        seed_mock(("insert",), [new_course])
 
         response = client.post(
             "/api/v1/courses",
-            headers=auth_headers,
+            headers=instructor_auth_headers,
             json=course_data
         )
 
-        assert response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("title") == course_data["title"]
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["title"] == course_data["title"]
+        assert data["instructor_id"] == mock_instructor["id"]
+
+    def test_create_course_as_student_forbidden(self, client, auth_headers):
+        """Test that students cannot create courses"""
+        response = client.post(
+            "/api/v1/courses",
+            headers=auth_headers,
+            json={"title": "New Course"}
+        )
 
-    def test_update_course(self, client, auth_headers, mock_course, mock_supabase_client):
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_update_course(self, client, instructor_auth_headers, mock_instructor, mock_course, seed_mock):
         """Test updating a course"""
         updated_data = {
             "title": "Updated Course Title",
             "description": "Updated description"
         }
 
-        mock_supabase_client.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [
+        seed_mock(("select", "eq", "single"), {"instructor_id": mock_instructor["id"]})
+        seed_mock(("update", "eq"), [
             {**mock_course, **updated_data}
-        ]
+        ])
 
         response = client.put(
             f"/api/v1/courses/{mock_course['id']}",
-            headers=auth_headers,
+            headers=instructor_auth_headers,
             json=updated_data
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("title") == updated_data["title"]
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == updated_data["title"]
 
-    def test_delete_course(self, client, auth_headers, mock_course, mock_supabase_client):
+    def test_delete_course(self, client, instructor_auth_headers, mock_instructor, mock_course, seed_mock):
         """Test deleting a course"""
-        mock_supabase_client.table.return_value.delete.return_value.eq.return_value.execute.return_value.data = None
+        seed_mock(("select", "eq", "single"), {"instructor_id": mock_instructor["id"]})
+        seed_mock(("delete", "eq"), None)
 
         response = client.delete(
             f"/api/v1/courses/{mock_course['id']}",
-            headers=auth_headers
+            headers=instructor_auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_204_NO_CONTENT, status.HTTP_200_OK,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert response.status_code == status.HTTP_204_NO_CONTENT
 
-    def test_search_courses(self, client, auth_headers, mock_supabase_client):
+    def test_search_courses(self, client, auth_headers, mock_courses, seed_mock):
         """Test searching courses"""
-        courses = [
-            {"id": "1", "title": "Python Course", "category": "programming"},
-            {"id": "2", "title": "Python Web Dev", "category": "programming"}
-        ]
+        courses = [c for c in mock_courses if "python" in c["title"].lower()]
 
-        mock_supabase_client.table.return_value.select.return_value.ilike.return_value.range.return_value.order.return_value.execute.return_value.data = courses
-        mock_supabase_client.table.return_value.select.return_value.ilike.return_value.range.return_value.order.return_value.execute.return_value.count = len(courses)
+        seed_mock(("select", "ilike", "eq", "range", "order"), courses, count=len(courses))
 
         response = client.get(
             "/api/v1/courses?search=python",
             headers=auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert isinstance(data, dict) or isinstance(data, list)
-
-
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 2
+        assert all("Python" in c["title"] for c in data["courses"])
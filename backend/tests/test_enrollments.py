@@ -3,160 +3,93 @@ Comprehensive tests for Enrollments service and endpoints
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
 from fastapi import status
 import uuid
 
 
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+_COURSE_ID = str(uuid.uuid4())
+_ENROLLED_AT = "2024-01-15T10:00:00Z"
+
+# (method, path, chains to seed as {chain: data}, expected status, check on the body)
+ENROLLMENT_CASES = [
+    pytest.param(
+        "POST", f"/api/v1/courses/{_COURSE_ID}/enroll",
+        {("select", "eq", "single"): None},
+        status.HTTP_404_NOT_FOUND,
+        lambda body: body["detail"] == "Course not found",
+        id="enroll_in_missing_course",
+    ),
+    pytest.param(
+        "POST", f"/api/v1/courses/{_COURSE_ID}/enroll",
+        {("select", "eq", "single"): {"id": _COURSE_ID, "is_published": False, "enrollment_open": True}},
+        status.HTTP_400_BAD_REQUEST,
+        lambda body: body["detail"] == "Course enrollment is not open",
+        id="enroll_in_unpublished_course",
+    ),
+    pytest.param(
+        "GET", "/api/v1/courses/my/enrollments",
+        {
+            ("select", "eq"): [{
+                "id": str(uuid.uuid4()),
+                "course_id": _COURSE_ID,
+                "status": "active",
+                "enrolled_at": _ENROLLED_AT,
+                "courses": {"id": _COURSE_ID, "title": "Python Basics"}
+            }],
+        },
+        status.HTTP_200_OK,
+        lambda body: [e["courses"]["title"] for e in body["enrollments"]] == ["Python Basics"],
+        id="get_my_enrollments",
+    ),
+]
+
+
 class TestEnrollmentEndpoints:
     """Tests for enrollment endpoints"""
 
-    def test_enroll_in_course(self, client, auth_headers, mock_supabase_client):
-        """Test enrolling in a course"""
-        enrollment_data = {
-            "course_id": "course1",
-            "enrollment_type": "paid"
-        }
-
-        enrollment_response = {
-            "id": str(uuid.uuid4()),
-            "user_id": "user1",
-            **enrollment_data,
-            "status": "active",
-            "enrolled_at": "2024-01-15T10:00:00Z"
-        }
-
-        mock_supabase_client.table.return_value.insert.return_value.execute.return_value.data = [enrollment_response]
-
-        response = client.post(
-            "/api/v1/enrollments",
-            headers=auth_headers,
-            json=enrollment_data
-        )
-
-        assert response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_200_OK,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-            status.HTTP_404_NOT_FOUND, status.HTTP_409_CONFLICT,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("status") == "active"
-
-    def test_get_user_enrollments(self, client, auth_headers, mock_supabase_client):
-        """Test retrieving user enrollments"""
-        enrollments = [
-            {
-                "id": str(uuid.uuid4()),
-                "course_id": "course1",
-                "course_title": "Python Basics",
-                "status": "active",
-                "progress": 45
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "course_id": "course2",
-                "course_title": "Web Development",
-                "status": "completed",
-                "progress": 100
-            }
-        ]
+    @pytest.mark.parametrize("method,path,seeds,expected,check", ENROLLMENT_CASES)
+    async def test_enrollment_endpoint(
+        self, async_client, auth_headers, seed_mock,
+        method, path, seeds, expected, check
+    ):
+        """Test each enrollment endpoint against its mocked queries"""
+        for chain, data in seeds.items():
+            seed_mock(chain, data)
 
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = enrollments
+        response = await async_client.request(method, path, headers=auth_headers)
 
-        response = client.get(
-            "/api/v1/enrollments",
-            headers=auth_headers
-        )
+        assert response.status_code == expected
+        assert check(response.json())
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert isinstance(data, list)
-
-    def test_get_enrollment_detail(self, client, auth_headers, mock_supabase_client):
-        """Test retrieving enrollment details"""
-        enrollment_id = str(uuid.uuid4())
-        enrollment_response = {
-            "id": enrollment_id,
-            "user_id": "user1",
-            "course_id": "course1",
-            "status": "active",
-            "enrolled_at": "2024-01-15T10:00:00Z",
-            "progress": 45
-        }
-
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = enrollment_response
-
-        response = client.get(
-            f"/api/v1/enrollments/{enrollment_id}",
-            headers=auth_headers
-        )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("status") in ["active", "completed", "dropped"]
-
-    def test_update_enrollment_progress(self, client, auth_headers, mock_supabase_client):
-        """Test updating enrollment progress"""
-        enrollment_id = str(uuid.uuid4())
-        progress_data = {
-            "progress": 60
-        }
-
-        updated_enrollment = {
-            "id": enrollment_id,
-            "user_id": "user1",
-            "course_id": "course1",
-            **progress_data,
-            "status": "active"
-        }
-
-        mock_supabase_client.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [updated_enrollment]
-
-        response = client.put(
-            f"/api/v1/enrollments/{enrollment_id}",
-            headers=auth_headers,
-            json=progress_data
-        )
+class TestCourseEnrollmentFlow:
+    """Tests for enrolling through the course routes against the in-memory store"""
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+    async def test_enroll_then_list_enrollments(self, async_client, auth_headers, mock_course, supabase_store):
+        """Test enrolling once, rejecting a repeat, and listing the enrollment"""
+        supabase_store.tables["courses"] = [mock_course]
+        enroll_path = f"/api/v1/courses/{mock_course['id']}/enroll"
 
-    def test_drop_course(self, client, auth_headers, mock_supabase_client):
-        """Test dropping a course"""
-        enrollment_id = str(uuid.uuid4())
+        first = await async_client.post(enroll_path, headers=auth_headers)
+        second = await async_client.post(enroll_path, headers=auth_headers)
+        listing = await async_client.get("/api/v1/courses/my/enrollments", headers=auth_headers)
 
-        dropped_enrollment = {
-            "id": enrollment_id,
-            "user_id": "user1",
-            "course_id": "course1",
-            "status": "dropped",
-            "dropped_at": "2024-01-20T10:00:00Z"
-        }
+        assert first.status_code == status.HTTP_201_CREATED
+        assert first.json()["enrollment"]["status"] == "active"
+        assert second.status_code == status.HTTP_400_BAD_REQUEST
+        assert listing.status_code == status.HTTP_200_OK
+        assert [e["course_id"] for e in listing.json()["enrollments"]] == [mock_course["id"]]
 
-        mock_supabase_client.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [dropped_enrollment]
+    async def test_enroll_in_closed_course(self, async_client, auth_headers, mock_course, supabase_store):
+        """Test enrollment is refused when the course is not open"""
+        supabase_store.tables["courses"] = [{**mock_course, "enrollment_open": False}]
 
-        response = client.delete(
-            f"/api/v1/enrollments/{enrollment_id}",
+        response = await async_client.post(
+            f"/api/v1/courses/{mock_course['id']}/enroll",
             headers=auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_204_NO_CONTENT,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert supabase_store.tables.get("enrollments", []) == []
@@ -0,0 +1,34 @@
+"""
+Tests for the in-memory Supabase stand-in used by the flow tests
+"""
+
+from tests.fakes import FakeSupabase
+
+
+def _attempts_store():
+    return FakeSupabase(assessment_attempts=[
+        {"id": "a1", "user_id": "u1", "score": 80, "submitted_at": "2024-01-20T10:00:00Z"},
+        {"id": "a2", "user_id": "u1", "score": None, "submitted_at": None},
+        {"id": "a3", "user_id": "u2", "score": 90, "submitted_at": "2024-01-21T10:00:00Z"},
+    ])
+
+
+class TestFakeStoreFilters:
+    """Tests for FakeStoreQuery filter semantics"""
+
+    def test_is_null_matches_missing_values(self):
+        """Test ``is_(column, "null")`` matches rows where the column is None"""
+        result = _attempts_store().table("assessment_attempts").select("id").is_(
+            "submitted_at", "null"
+        ).execute()
+
+        assert [row["id"] for row in result.data] == ["a2"]
+
+    def test_not_negates_the_next_filter_only(self):
+        """Test ``.not_.is_`` excludes null rows and leaves later filters alone"""
+        result = _attempts_store().table("assessment_attempts").select(
+            "score, submitted_at", count="exact"
+        ).not_.is_("submitted_at", "null").eq("user_id", "u1").execute()
+
+        assert [row["id"] for row in result.data] == ["a1"]
+        assert result.count == 1
@@ -2,310 +2,209 @@
 Integration tests for the SLMS backend
 """
 
+import asyncio
+import orjson
 import pytest
 from fastapi import status
 import uuid
-from unittest.mock import MagicMock, patch
+
+from tests.helpers import JSON_HEADERS, status_only
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+_ASSESSMENT_ID = str(uuid.uuid4())
+
+# Static request bodies, encoded once for the module
+_SIGNUP_BODY = orjson.dumps({
+    "email": "newuser@example.com",
+    "password": "SecurePassword123!",
+    "full_name": "New User"
+})
+_LOGIN_BODY = orjson.dumps({
+    "email": "newuser@example.com",
+    "password": "SecurePassword123!"
+})
+_ORDER_BODY = orjson.dumps({"assessment_id": _ASSESSMENT_ID})
+_INVALID_PAYMENT_BODY = orjson.dumps({"amount": -100})  # Invalid amount
+
+_SIGNUP_OK = frozenset({
+    status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST,
+    status.HTTP_404_NOT_FOUND, status.HTTP_409_CONFLICT,
+    status.HTTP_500_INTERNAL_SERVER_ERROR,
+})
+_LOGIN_OK = frozenset({
+    status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
+    status.HTTP_401_UNAUTHORIZED, status.HTTP_500_INTERNAL_SERVER_ERROR,
+})
+_PROFILE_OK = frozenset({
+    status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
+    status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN,
+    status.HTTP_500_INTERNAL_SERVER_ERROR,
+})
 
 
 class TestAuthFlow:
     """Integration tests for authentication flow"""
 
-    def test_complete_auth_flow(self, client, mock_supabase_client):
+    async def test_complete_auth_flow(self, async_client, mock_supabase_client):
         """Test complete authentication flow: signup, login, access protected resource"""
         # Signup
-        signup_data = {
-            "email": "newuser@example.com",
-            "password": "SecurePassword123!",
-            "full_name": "New User"
-        }
-
-        signup_response = client.post(
+        signup_response = await async_client.post(
             "/api/v1/auth/signup",
-            json=signup_data
+            headers=JSON_HEADERS,
+            content=_SIGNUP_BODY
         )
 
-        assert signup_response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_409_CONFLICT,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert signup_response.status_code in _SIGNUP_OK
 
         # Login
-        login_data = {
-            "email": signup_data["email"],
-            "password": signup_data["password"]
-        }
-
-        login_response = client.post(
+        login_response = await async_client.post(
             "/api/v1/auth/login",
-            json=login_data
+            headers=JSON_HEADERS,
+            content=_LOGIN_BODY
         )
 
-        assert login_response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_401_UNAUTHORIZED, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert login_response.status_code in _LOGIN_OK
 
         # Access protected resource
         if login_response.status_code == status.HTTP_200_OK:
             token_data = login_response.json()
             if "access_token" in token_data:
                 headers = {"Authorization": f"Bearer {token_data['access_token']}"}
-                profile_response = client.get("/api/v1/users/me/profile", headers=headers)
-                assert profile_response.status_code in [
-                    status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-                    status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN,
-                    status.HTTP_500_INTERNAL_SERVER_ERROR
-                ]
+                profile_response = await async_client.get("/api/v1/users/me/profile", headers=headers)
+                assert profile_response.status_code in _PROFILE_OK
 
 
 class TestEnrollmentFlow:
     """Integration tests for enrollment and learning flow"""
 
-    def test_course_enrollment_and_learning(self, client, auth_headers, mock_supabase_client):
+    async def test_course_enrollment_and_learning(self, async_client, auth_headers, mock_course, supabase_store):
         """Test complete flow: browse courses, enroll, access content"""
-        # List courses
-        course_response = client.get(
-            "/api/v1/courses",
-            headers=auth_headers
+        supabase_store.tables["courses"] = [mock_course]
+        course_id = mock_course["id"]
+
+        # List courses and get course details (independent, so fired together)
+        course_response, detail_response = await asyncio.gather(
+            async_client.get("/api/v1/courses", headers=auth_headers),
+            async_client.get(f"/api/v1/courses/{course_id}", headers=auth_headers),
         )
-        assert course_response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-        # Get course details
-        course_id = str(uuid.uuid4())
-        detail_response = client.get(
-            f"/api/v1/courses/{course_id}",
+        assert course_response.status_code == status.HTTP_200_OK
+        assert [c["id"] for c in course_response.json()["courses"]] == [course_id]
+        assert detail_response.status_code == status.HTTP_200_OK
+        assert detail_response.json()["title"] == mock_course["title"]
+
+        # Enroll in course
+        enroll_response = await async_client.post(
+            f"/api/v1/courses/{course_id}/enroll",
             headers=auth_headers
         )
-        assert detail_response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert enroll_response.status_code == status.HTTP_201_CREATED
 
-        # Enroll in course
-        enroll_response = client.post(
-            "/api/v1/enrollments",
-            headers=auth_headers,
-            json={"course_id": course_id}
+        # Access course content, now allowed through the enrollment
+        content_response = await async_client.get(
+            f"/api/v1/content/courses/{course_id}/videos",
+            headers=auth_headers
         )
-        assert enroll_response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_200_OK,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-            status.HTTP_404_NOT_FOUND, status.HTTP_409_CONFLICT,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-        # Access course content
-        if enroll_response.status_code < 400:
-            content_response = client.get(
-                f"/api/v1/courses/{course_id}/content",
-                headers=auth_headers
-            )
-            assert content_response.status_code in [
-                status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-                status.HTTP_500_INTERNAL_SERVER_ERROR
-            ]
+        assert content_response.status_code == status.HTTP_200_OK
+        assert content_response.json() == []
 
 
 class TestPaymentFlow:
     """Integration tests for payment flow"""
 
-    def test_payment_flow(self, client, auth_headers, mock_supabase_client):
-        """Test payment initiation and verification"""
-        course_id = str(uuid.uuid4())
-
-        # Initiate payment
-        payment_response = client.post(
-            "/api/v1/payments/initiate",
-            headers=auth_headers,
-            json={
-                "course_id": course_id,
-                "amount": 99.99,
-                "currency": "USD"
-            }
+    async def test_free_exam_order_grants_access(self, async_client, auth_headers, supabase_store):
+        """Test ordering a free exam grants access without taking a payment"""
+        supabase_store.tables["exam_pricing"] = [{
+            "assessment_id": _ASSESSMENT_ID,
+            "is_free": True,
+            "price_inr": 0,
+            "discount_percentage": 0
+        }]
+
+        # Order the exam: free exams are granted instead of billed
+        order_response = await async_client.post(
+            "/api/v1/payments/orders",
+            headers={**JSON_HEADERS, **auth_headers},
+            content=_ORDER_BODY
         )
 
-        assert payment_response.status_code in [
-            status.HTTP_200_OK, status.HTTP_201_CREATED,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-        # Verify payment if initiated
-        if payment_response.status_code < 400:
-            payment_data = payment_response.json()
-            if "id" in payment_data:
-                payment_id = payment_data["id"]
-                verify_response = client.get(
-                    f"/api/v1/payments/{payment_id}/verify",
-                    headers=auth_headers
-                )
-                assert verify_response.status_code in [
-                    status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-                    status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-                    status.HTTP_500_INTERNAL_SERVER_ERROR
-                ]
-
-
-class TestAssessmentFlow:
-    """Integration tests for assessment flow"""
-
-    def test_assessment_flow(self, client, auth_headers, mock_supabase_client):
-        """Test complete assessment flow: retrieve, attempt, get results"""
-        assessment_id = str(uuid.uuid4())
-
-        # Get assessment
-        get_response = client.get(
-            f"/api/v1/assessments/{assessment_id}",
-            headers=auth_headers
-        )
+        assert order_response.status_code == status.HTTP_400_BAD_REQUEST
+        assert order_response.json()["detail"] == "This exam is free"
 
-        assert get_response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-        # Submit answers
-        if get_response.status_code < 400:
-            submission_response = client.post(
-                "/api/v1/assessments/submit",
-                headers=auth_headers,
-                json={
-                    "assessment_id": assessment_id,
-                    "answers": {
-                        "q1": "answer1",
-                        "q2": "answer2"
-                    }
-                }
-            )
-
-            assert submission_response.status_code in [
-                status.HTTP_200_OK, status.HTTP_201_CREATED,
-                status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-                status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-            ]
-
-            # Get result
-            if submission_response.status_code < 400:
-                result_data = submission_response.json()
-                if "id" in result_data:
-                    result_response = client.get(
-                        f"/api/v1/assessments/{result_data['id']}",
-                        headers=auth_headers
-                    )
-                    assert result_response.status_code in [
-                        status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-                        status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-                        status.HTTP_500_INTERNAL_SERVER_ERROR
-                    ]
-
-
-class TestAnalyticsFlow:
-    """Integration tests for analytics tracking"""
-
-    def test_analytics_data_retrieval(self, client, auth_headers, mock_supabase_client):
-        """Test retrieving analytics data"""
-        # Get user analytics
-        user_analytics_response = client.get(
-            "/api/v1/analytics/user",
+        # Access is now recorded for the user
+        access_response = await async_client.get(
+            f"/api/v1/payments/access/{_ASSESSMENT_ID}",
             headers=auth_headers
         )
 
-        assert user_analytics_response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert access_response.status_code == status.HTTP_200_OK
+        assert (access_response.json()["has_access"], access_response.json()["requires_payment"]) == (True, False)
+        assert [row["assessment_id"] for row in supabase_store.tables["exam_access"]] == [_ASSESSMENT_ID]
 
-        # Get learning progress
-        progress_response = client.get(
-            "/api/v1/analytics/progress",
-            headers=auth_headers
-        )
 
-        assert progress_response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+async def _check_unauthorized_access(async_client):
+    """Accessing protected resources without auth"""
+    status_code = await status_only(async_client, "GET", "/api/v1/users/me")
 
-        # Get performance metrics
-        metrics_response = client.get(
-            "/api/v1/analytics/performance",
-            headers=auth_headers
-        )
+    assert status_code == status.HTTP_403_FORBIDDEN
 
-        assert metrics_response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
 
+async def _check_invalid_course_id(async_client, auth_headers):
+    """Accessing non-existent course"""
+    status_code = await status_only(
+        async_client, "GET", "/api/v1/courses/invalid-course-id",
+        headers=auth_headers
+    )
 
-class TestErrorHandling:
-    """Integration tests for error handling"""
+    assert status_code == status.HTTP_404_NOT_FOUND
 
-    def test_unauthorized_access(self, client):
-        """Test accessing protected resources without auth"""
-        response = client.get("/api/v1/users/me/profile")
 
-        assert response.status_code in [
-            status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_404_NOT_FOUND
-        ]
+async def _check_invalid_payment_data(async_client, auth_headers):
+    """Creating a payment order with invalid data"""
+    status_code = await status_only(
+        async_client, "POST", "/api/v1/payments/orders",
+        headers={**JSON_HEADERS, **auth_headers},
+        content=_INVALID_PAYMENT_BODY
+    )
 
-    def test_invalid_course_id(self, client, auth_headers):
-        """Test accessing non-existent course"""
-        response = client.get(
-            "/api/v1/courses/invalid-course-id",
-            headers=auth_headers
-        )
+    assert status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-        assert response.status_code in [
-            status.HTTP_404_NOT_FOUND, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-    def test_invalid_payment_data(self, client, auth_headers):
-        """Test initiating payment with invalid data"""
-        response = client.post(
-            "/api/v1/payments/initiate",
-            headers=auth_headers,
-            json={"amount": -100}  # Invalid amount
-        )
 
-        assert response.status_code in [
-            status.HTTP_400_BAD_REQUEST, status.HTTP_422_UNPROCESSABLE_ENTITY,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+async def _check_duplicate_enrollment(async_client, auth_headers, course_id):
+    """Enrolling in same course twice"""
+    enroll_path = f"/api/v1/courses/{course_id}/enroll"
 
-    def test_duplicate_enrollment(self, client, auth_headers, mock_supabase_client):
-        """Test enrolling in same course twice"""
-        course_id = str(uuid.uuid4())
+    # First enrollment
+    first_status = await status_only(async_client, "POST", enroll_path, headers=auth_headers)
 
-        # First enrollment
-        first_response = client.post(
-            "/api/v1/enrollments",
-            headers=auth_headers,
-            json={"course_id": course_id}
-        )
+    # Second enrollment (duplicate)
+    second_status = await status_only(async_client, "POST", enroll_path, headers=auth_headers)
+
+    assert (first_status, second_status) == (status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST)
 
-        # Second enrollment (duplicate)
-        second_response = client.post(
-            "/api/v1/enrollments",
-            headers=auth_headers,
-            json={"course_id": course_id}
+
+class TestErrorHandling:
+    """Integration tests for error handling"""
+
+    @pytest.mark.fast
+    async def test_error_matrix(self, async_client, auth_headers):
+        """Test unauthorized access and invalid payment data"""
+        # Both are rejected by the auth and body validation layers before any
+        # handler runs, so neither reaches Supabase; they run concurrently
+        await asyncio.gather(
+            _check_unauthorized_access(async_client),
+            _check_invalid_payment_data(async_client, auth_headers),
         )
 
-        # Second enrollment should either succeed or return conflict
-        assert second_response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_200_OK,
-            status.HTTP_409_CONFLICT, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+    async def test_duplicate_enrollment(self, async_client, auth_headers, mock_course, supabase_store):
+        """Test enrolling in the same course twice against the in-memory store"""
+        supabase_store.tables["courses"] = [mock_course]
+
+        await _check_duplicate_enrollment(async_client, auth_headers, mock_course["id"])
+
+    async def test_invalid_course_id(self, async_client, auth_headers, seed_mock):
+        """Test accessing a non-existent course, which queries Supabase"""
+        seed_mock(("select", "eq", "single"), None)
+
+        await _check_invalid_course_id(async_client, auth_headers)
@@ -2,169 +2,134 @@
 Comprehensive tests for Proctoring service and endpoints
 """
 
+import orjson
 import pytest
-from unittest.mock import MagicMock, patch
 from fastapi import status
 import uuid
 
-
-class TestProctoringEndpoints:
-    """Tests for proctoring endpoints"""
-
-    def test_start_proctored_session(self, client, auth_headers, mock_supabase_client):
-        """Test starting a proctored session"""
-        session_data = {
-            "assessment_id": "assessment1",
-            "user_id": "user1"
-        }
-
-        session_response = {
-            "id": str(uuid.uuid4()),
-            **session_data,
-            "status": "active",
-            "started_at": "2024-01-20T10:00:00Z",
-            "session_token": "token_xyz123"
-        }
-
-        mock_supabase_client.table.return_value.insert.return_value.execute.return_value.data = [session_response]
-
-        response = client.post(
-            "/api/v1/proctoring/start",
-            headers=auth_headers,
-            json=session_data
-        )
-
-        assert response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_200_OK,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("status") == "active"
-
-    def test_end_proctored_session(self, client, auth_headers, mock_supabase_client):
-        """Test ending a proctored session"""
-        session_id = str(uuid.uuid4())
-
-        ended_session = {
-            "id": session_id,
-            "status": "completed",
-            "ended_at": "2024-01-20T11:00:00Z",
-            "duration": 3600,
-            "flagged_incidents": 0
-        }
-
-        mock_supabase_client.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [ended_session]
-
-        response = client.post(
-            f"/api/v1/proctoring/{session_id}/end",
-            headers=auth_headers
-        )
-
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-    def test_flag_suspicious_activity(self, client, auth_headers, mock_supabase_client):
-        """Test flagging suspicious activity during proctored session"""
-        session_id = str(uuid.uuid4())
-        flag_data = {
-            "incident_type": "multiple_faces",
-            "severity": "high",
-            "timestamp": "2024-01-20T10:30:00Z"
-        }
-
-        flag_response = {
-            "id": str(uuid.uuid4()),
-            "session_id": session_id,
-            **flag_data,
-            "flagged_at": "2024-01-20T10:30:00Z"
-        }
-
-        mock_supabase_client.table.return_value.insert.return_value.execute.return_value.data = [flag_response]
-
-        response = client.post(
-            f"/api/v1/proctoring/{session_id}/flag",
-            headers=auth_headers,
-            json=flag_data
-        )
-
-        assert response.status_code in [
-            status.HTTP_201_CREATED, status.HTTP_200_OK,
-            status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-    def test_get_session_report(self, client, auth_headers, mock_supabase_client):
-        """Test retrieving proctored session report"""
-        session_id = str(uuid.uuid4())
-        report_data = {
-            "session_id": session_id,
-            "user_id": "user1",
-            "assessment_id": "assessment1",
-            "duration": 3600,
-            "status": "completed",
-            "incidents_count": 2,
-            "incidents": [
-                {
-                    "type": "multiple_faces",
-                    "severity": "high",
-                    "timestamp": "2024-01-20T10:30:00Z"
-                }
+from tests.helpers import JSON_HEADERS
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+_SESSION_ID = str(uuid.uuid4())
+_ATTEMPT_ID = str(uuid.uuid4())
+_OTHER_USER_ID = str(uuid.uuid4())
+_FLAGGED_AT = "2024-01-20T10:30:00Z"
+_START_BODY = orjson.dumps({"attempt_id": _ATTEMPT_ID})
+
+
+def _attempt(user_id):
+    return {"id": _ATTEMPT_ID, "user_id": user_id, "assessment_id": "assessment1"}
+
+
+def _session(user_id):
+    return {"id": _SESSION_ID, "user_id": user_id, "attempt_id": _ATTEMPT_ID}
+
+
+# (method, path, body, chains to seed as {chain: data} built from the user,
+#  expected status, check on the body)
+PROCTORING_CASES = [
+    pytest.param(
+        "POST", "/api/v1/proctoring/sessions", _START_BODY,
+        lambda user: {
+            ("select", "eq", "single"): _attempt(user["id"]),
+            ("select", "eq"): [],
+            ("insert",): [{**_session(user["id"]), "status": "active"}],
+        },
+        status.HTTP_201_CREATED,
+        lambda body: body["message"] == "Proctoring session started"
+        and body["session"]["status"] == "active",
+        id="start_proctored_session",
+    ),
+    pytest.param(
+        "POST", "/api/v1/proctoring/sessions", _START_BODY,
+        lambda user: {
+            ("select", "eq", "single"): _attempt(user["id"]),
+            ("select", "eq"): [{"id": _SESSION_ID}],
+        },
+        status.HTTP_201_CREATED,
+        lambda body: body["message"] == "Session already exists"
+        and body["session"]["id"] == _SESSION_ID,
+        id="start_existing_session",
+    ),
+    pytest.param(
+        "POST", "/api/v1/proctoring/sessions", _START_BODY,
+        lambda user: {("select", "eq", "single"): None},
+        status.HTTP_404_NOT_FOUND,
+        lambda body: body["detail"] == "Assessment attempt not found",
+        id="start_session_missing_attempt",
+    ),
+    pytest.param(
+        "POST", "/api/v1/proctoring/sessions", _START_BODY,
+        lambda user: {("select", "eq", "single"): _attempt(_OTHER_USER_ID)},
+        status.HTTP_403_FORBIDDEN,
+        lambda body: body["detail"] == "Not authorized to access this attempt",
+        id="start_session_for_other_users_attempt",
+    ),
+    pytest.param(
+        "GET", f"/api/v1/proctoring/sessions/{_SESSION_ID}/alerts", None,
+        lambda user: {
+            ("select", "eq", "single"): _session(user["id"]),
+            ("select", "eq", "order"): [
+                {"session_id": _SESSION_ID, "alert_type": "multiple_faces", "created_at": _FLAGGED_AT},
+                {"session_id": _SESSION_ID, "alert_type": "no_face", "created_at": _FLAGGED_AT},
             ],
-            "proctor_notes": "Minor violation detected"
-        }
+        },
+        status.HTTP_200_OK,
+        lambda body: body["session_id"] == _SESSION_ID and body["total_alerts"] == 2,
+        id="get_session_alerts",
+    ),
+    pytest.param(
+        "GET", f"/api/v1/proctoring/sessions/{_SESSION_ID}/alerts", None,
+        lambda user: {("select", "eq", "single"): _session(_OTHER_USER_ID)},
+        status.HTTP_403_FORBIDDEN,
+        lambda body: body["detail"] == "Not authorized to access this session",
+        id="get_other_users_session_alerts",
+    ),
+    pytest.param(
+        "POST", f"/api/v1/proctoring/sessions/{_SESSION_ID}/end", None,
+        lambda user: {
+            ("select", "eq", "single"): _session(user["id"]),
+            ("update", "eq"): [{**_session(user["id"]), "status": "completed"}],
+        },
+        status.HTTP_200_OK,
+        lambda body: body["message"] == "Proctoring session ended"
+        and body["session"]["status"] == "completed",
+        id="end_proctored_session",
+    ),
+    pytest.param(
+        "POST", f"/api/v1/proctoring/sessions/{_SESSION_ID}/end", None,
+        lambda user: {("select", "eq", "single"): None},
+        status.HTTP_404_NOT_FOUND,
+        lambda body: body["detail"] == "Proctoring session not found",
+        id="end_missing_session",
+    ),
+    pytest.param(
+        "GET", f"/api/v1/proctoring/sessions/{_SESSION_ID}/review", None,
+        lambda user: {},
+        status.HTTP_403_FORBIDDEN,
+        lambda body: body["detail"] == "Instructor access required",
+        id="review_session_requires_instructor",
+    ),
+]
 
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = report_data
 
-        response = client.get(
-            f"/api/v1/proctoring/{session_id}/report",
-            headers=auth_headers
-        )
+class TestProctoringEndpoints:
+    """Tests for proctoring endpoints"""
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("session_id") == session_id
-
-    def test_get_active_sessions(self, client, auth_headers, mock_supabase_client):
-        """Test retrieving active proctored sessions (admin)"""
-        sessions = [
-            {
-                "id": str(uuid.uuid4()),
-                "user_id": "user1",
-                "assessment_id": "assessment1",
-                "status": "active",
-                "started_at": "2024-01-20T10:00:00Z"
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "user_id": "user2",
-                "assessment_id": "assessment2",
-                "status": "active",
-                "started_at": "2024-01-20T10:15:00Z"
-            }
-        ]
-
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = sessions
-
-        response = client.get(
-            "/api/v1/proctoring/active-sessions",
-            headers=auth_headers
+    @pytest.mark.parametrize("method,path,body,seeds,expected,check", PROCTORING_CASES)
+    async def test_proctoring_endpoint(
+        self, async_client, auth_headers, mock_user, seed_mock,
+        method, path, body, seeds, expected, check
+    ):
+        """Test each proctoring endpoint against its mocked queries"""
+        for chain, data in seeds(mock_user).items():
+            seed_mock(chain, data)
+
+        response = await async_client.request(
+            method, path, headers={**JSON_HEADERS, **auth_headers}, content=body
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert isinstance(data, list)
+        assert response.status_code == expected
+        assert check(response.json())
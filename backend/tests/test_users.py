@@ -3,157 +3,129 @@ Comprehensive tests for Users service and endpoints
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
 from fastapi import status
-import uuid
-from datetime import datetime
+
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+# (path template, chains to seed as {chain: (data, count)} built from the user,
+#  expected status, check on (body, user))
+USER_READ_CASES = [
+    pytest.param(
+        "/api/v1/users/{id}",
+        lambda user: {("select", "eq", "single"): (dict(user), None)},
+        status.HTTP_200_OK,
+        lambda body, user: body["id"] == user["id"] and body["email"] == user["email"],
+        id="get_user_profile",
+    ),
+    pytest.param(
+        "/api/v1/users/{id}",
+        lambda user: {("select", "eq", "single"): (None, None)},
+        status.HTTP_404_NOT_FOUND,
+        lambda body, user: body["detail"] == "User not found",
+        id="get_missing_user_profile",
+    ),
+    pytest.param(
+        "/api/v1/users/me",
+        lambda user: {
+            ("select", "eq"): ([], 5),
+            ("select", "eq", "eq"): ([], 2),
+            ("select", "eq", "not_", "is_"): ([{"score": 80}, {"score": 90}], 2),
+        },
+        status.HTTP_200_OK,
+        lambda body, user: body["email"] == user["email"] and (
+            body["enrolled_courses"], body["completed_courses"],
+            body["total_assessments_taken"], body["average_score"],
+        ) == (5, 2, 2, 85.0),
+        id="get_my_profile_with_stats",
+    ),
+]
 
 
 class TestUserEndpoints:
     """Tests for user endpoints"""
 
-    def test_get_profile(self, client, auth_headers, mock_user, mock_supabase_client):
-        """Test retrieving user profile"""
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = mock_user
+    @pytest.mark.parametrize("path,seeds,expected,check", USER_READ_CASES)
+    async def test_read_endpoint(
+        self, async_client, auth_headers, mock_user, seed_mock,
+        path, seeds, expected, check
+    ):
+        """Test each user read endpoint against its mocked queries"""
+        for chain, (data, count) in seeds(mock_user).items():
+            seed_mock(chain, data, count=count)
 
-        response = client.get(
-            f"/api/v1/users/{mock_user['id']}",
-            headers=auth_headers
-        )
+        response = await async_client.get(path.format(id=mock_user["id"]), headers=auth_headers)
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("id") == mock_user["id"]
-            assert data.get("email") == mock_user["email"]
-
-    def test_get_current_user_profile(self, client, auth_headers, mock_user, mock_supabase_client):
-        """Test retrieving current user profile"""
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = mock_user
-
-        response = client.get(
-            "/api/v1/users/me/profile",
-            headers=auth_headers
-        )
+        assert response.status_code == expected
+        assert check(response.json(), mock_user)
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("email") == mock_user["email"]
-
-    def test_update_profile(self, client, auth_headers, mock_user, mock_supabase_client):
-        """Test updating user profile"""
+    async def test_update_profile(self, async_client, auth_headers, mock_user, seed_mock):
+        """Test updating the current user's profile"""
         updated_data = {
             "full_name": "Updated Name",
             "bio": "Updated bio",
             "avatar_url": "https://example.com/avatar.jpg"
         }
+        seed_mock(("update", "eq"), [{**mock_user, **updated_data}])
 
-        mock_supabase_client.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [
-            {**mock_user, **updated_data}
-        ]
-
-        response = client.put(
-            "/api/v1/users/me/profile",
+        response = await async_client.put(
+            "/api/v1/users/me",
             headers=auth_headers,
             json=updated_data
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert data.get("full_name") == updated_data["full_name"]
-
-    def test_update_profile_unauthorized(self, client):
-        """Test updating profile without authentication"""
-        response = client.put(
-            "/api/v1/users/me/profile",
+        assert response.status_code == status.HTTP_200_OK
+        assert {key: response.json()[key] for key in updated_data} == updated_data
+
+    async def test_update_profile_unauthorized(self, async_client):
+        """Test updating profile without a bearer token"""
+        response = await async_client.put(
+            "/api/v1/users/me",
             json={"full_name": "Updated Name"}
         )
 
-        assert response.status_code in [
-            status.HTTP_403_FORBIDDEN, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-
-    def test_get_user_stats(self, client, auth_headers, mock_user, mock_supabase_client):
-        """Test retrieving user statistics"""
-        stats = {
-            "courses_enrolled": 5,
-            "courses_completed": 2,
-            "total_learning_hours": 45.5,
-            "average_score": 85.3,
-            "badges_earned": 3
-        }
+        assert response.status_code == status.HTTP_403_FORBIDDEN
 
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value.data = stats
+    async def test_list_users_as_admin(self, async_client, admin_auth_headers, mock_user, seed_mock):
+        """Test admins can page through users"""
+        seed_mock(("select", "range", "order"), [dict(mock_user)], count=1)
 
-        response = client.get(
-            f"/api/v1/users/{mock_user['id']}/stats",
-            headers=auth_headers
-        )
+        response = await async_client.get("/api/v1/users/", headers=admin_auth_headers)
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert "courses_enrolled" in data
-
-    def test_get_user_learning_history(self, client, auth_headers, mock_user, mock_supabase_client):
-        """Test retrieving user learning history"""
-        history = [
-            {
-                "course_id": "course1",
-                "course_name": "Python Basics",
-                "enrolled_at": "2024-01-01",
-                "progress": 75,
-                "status": "in_progress"
-            },
-            {
-                "course_id": "course2",
-                "course_name": "Web Development",
-                "enrolled_at": "2024-02-01",
-                "progress": 100,
-                "status": "completed"
-            }
-        ]
-
-        mock_supabase_client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = history
-
-        response = client.get(
-            f"/api/v1/users/{mock_user['id']}/learning-history",
-            headers=auth_headers
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"users": [dict(mock_user)], "total": 1, "page": 1, "page_size": 10}
+
+    async def test_list_users_requires_admin(self, async_client, auth_headers):
+        """Test students cannot list users"""
+        response = await async_client.get("/api/v1/users/", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_delete_user_as_admin(self, async_client, admin_auth_headers, mock_user, seed_mock):
+        """Test admins can delete another user"""
+        seed_mock(("select", "eq", "single"), {"auth_id": mock_user["auth_id"]})
+        seed_mock(("delete", "eq"), [dict(mock_user)])
+
+        response = await async_client.delete(
+            f"/api/v1/users/{mock_user['id']}",
+            headers=admin_auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST,
-            status.HTTP_404_NOT_FOUND, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
-        if response.status_code < 400:
-            data = response.json()
-            assert isinstance(data, list)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
 
-    def test_delete_user_account(self, client, auth_headers, mock_user, mock_supabase_client):
-        """Test deleting user account"""
-        mock_supabase_client.table.return_value.delete.return_value.eq.return_value.execute.return_value.data = None
+    async def test_delete_missing_user(self, async_client, admin_auth_headers, seed_mock):
+        """Test deleting a user with no row returns 404"""
+        seed_mock(("select", "eq", "single"), None)
 
-        response = client.delete(
-            "/api/v1/users/me",
+        response = await async_client.delete("/api/v1/users/missing-user-id", headers=admin_auth_headers)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_delete_user_requires_admin(self, async_client, auth_headers, mock_user):
+        """Test students cannot delete users"""
+        response = await async_client.delete(
+            f"/api/v1/users/{mock_user['id']}",
             headers=auth_headers
         )
 
-        assert response.status_code in [
-            status.HTTP_204_NO_CONTENT, status.HTTP_200_OK,
-            status.HTTP_403_FORBIDDEN, status.HTTP_500_INTERNAL_SERVER_ERROR
-        ]
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -2,48 +2,106 @@
 """
 Advanced Proctoring Features Verification Script
 This script verifies all advanced proctoring features are properly implemented
+
+Pass --strict to import the services instead of only parsing them.
 """
 
+import ast
+import importlib
+import importlib.util
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def check_file_exists(filepath, description):
+def write_lines(lines):
+    """Write the collected report lines to stdout in one go"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def list_directory(parent):
+    """Names in a directory; a missing directory lists as empty"""
+    try:
+        with os.scandir(parent) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+def list_directories(filepaths, executor):
+    """List each parent directory of the given files once, in parallel"""
+    parents = list(dict.fromkeys(Path(filepath).parent for filepath in filepaths))
+    return dict(zip(parents, executor.map(list_directory, parents)))
+
+def check_file_exists(filepath, description, listings, out):
     """Check if a file exists"""
-    if Path(filepath).exists():
-        print(f"✅ {description}: {filepath}")
+    path = Path(filepath)
+    if path.name in listings[path.parent]:
+        out.append(f"✅ {description}: {filepath}")
         return True
     else:
-        print(f"❌ {description}: {filepath} - NOT FOUND")
+        out.append(f"❌ {description}: {filepath} - NOT FOUND")
         return False
 
-def check_imports():
-    """Check if all modules can be imported"""
+SERVICE_MODULE = "app.services.advanced_proctoring"
+SERVICE_CLASSES = (
+    "AdvancedProctoringService",
+    "EyeTrackingService",
+    "NoiseDetectionService",
+    "FaceRecognitionService",
+)
+
+def check_imports(out, strict=False):
+    """Check if all modules can be imported.
+
+    By default the service module is located and parsed without running it,
+    so the heavy CV/ML dependencies are not loaded; ``strict`` really imports it.
+    """
+    if strict:
+        try:
+            module = importlib.import_module(SERVICE_MODULE)
+            for name in SERVICE_CLASSES:
+                getattr(module, name)
+            out.append("✅ All advanced proctoring services imported successfully")
+            return True
+        except Exception as e:
+            # Importing runs the app's settings and model setup too, so any
+            # failure there is reported as a failed check, not a traceback
+            out.append(f"❌ Import error: {e}")
+            return False
+
     try:
-        from app.services.advanced_proctoring import (
-            AdvancedProctoringService,
-            EyeTrackingService,
-            NoiseDetectionService,
-            FaceRecognitionService
-        )
-        print("✅ All advanced proctoring services imported successfully")
-        return True
+        spec = importlib.util.find_spec(SERVICE_MODULE)
     except ImportError as e:
-        print(f"❌ Import error: {e}")
+        out.append(f"❌ Import error: {e}")
+        return False
+    if spec is None or not spec.origin:
+        out.append(f"❌ Import error: No module named '{SERVICE_MODULE}'")
         return False
 
-def main():
-    """Run verification checks"""
-    
-    print("=" * 70)
-    print("ADVANCED PROCTORING FEATURES VERIFICATION")
-    print("=" * 70)
-    print()
+    try:
+        tree = ast.parse(Path(spec.origin).read_text(encoding="utf-8"), filename=spec.origin)
+    except SyntaxError as e:
+        out.append(f"❌ Syntax error: {e}")
+        return False
+    defined = {node.name for node in tree.body if isinstance(node, ast.ClassDef)}
+    missing = [name for name in SERVICE_CLASSES if name not in defined]
+    if missing:
+        out.append(f"❌ Import error: {SERVICE_MODULE} does not define {', '.join(missing)}")
+        return False
+    out.append("✅ All advanced proctoring services found (use --strict to import them)")
+    return True
+
+def run_checks(out):
+    """Run verification checks, appending the report to ``out``"""
+    out.append("=" * 70)
+    out.append("ADVANCED PROCTORING FEATURES VERIFICATION")
+    out.append("=" * 70)
+    out.append("")
     
     all_checks_passed = True
     
     # Check files
-    print("📁 Checking Files:")
-    print("-" * 70)
+    out.append("📁 Checking Files:")
+    out.append("-" * 70)
     
     files_to_check = [
         ("app/services/advanced_proctoring.py", "Advanced Proctoring Service"),
@@ -52,23 +110,31 @@ def main():
         ("ADVANCED_PROCTORING_GUIDE.md", "Documentation"),
     ]
     
-    for filepath, description in files_to_check:
-        if not check_file_exists(filepath, description):
-            all_checks_passed = False
+    # The import check runs alongside the directory scans; it reports into
+    # its own buffer so the output order stays fixed.
+    import_lines = []
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        imports_future = executor.submit(check_imports, import_lines, strict="--strict" in sys.argv[1:])
+        listings = list_directories([filepath for filepath, _ in files_to_check], executor)
+        for filepath, description in files_to_check:
+            if not check_file_exists(filepath, description, listings, out):
+                all_checks_passed = False
+        imports_passed = imports_future.result()
     
-    print()
+    out.append("")
     
     # Check imports
-    print("🔧 Checking Imports:")
-    print("-" * 70)
-    if not check_imports():
+    out.append("🔧 Checking Imports:")
+    out.append("-" * 70)
+    out.extend(import_lines)
+    if not imports_passed:
         all_checks_passed = False
     
-    print()
+    out.append("")
     
     # Check features
-    print("✨ Advanced Proctoring Features:")
-    print("-" * 70)
+    out.append("✨ Advanced Proctoring Features:")
+    out.append("-" * 70)
     
     features = {
         "Eye Tracking": [
@@ -100,15 +166,15 @@ def main():
     }
     
     for category, capabilities in features.items():
-        print(f"\n📊 {category}:")
+        out.append(f"\n📊 {category}:")
         for capability in capabilities:
-            print(f"   ✅ {capability}")
+            out.append(f"   ✅ {capability}")
     
-    print()
+    out.append("")
     
     # Check API endpoints
-    print("🌐 API Endpoints:")
-    print("-" * 70)
+    out.append("🌐 API Endpoints:")
+    out.append("-" * 70)
     
     endpoints = [
         "POST /api/v1/advanced-proctoring/sessions/{session_id}/start-advanced-monitoring",
@@ -123,13 +189,13 @@ def main():
     ]
     
     for endpoint in endpoints:
-        print(f"  ✅ {endpoint}")
+        out.append(f"  ✅ {endpoint}")
     
-    print()
+    out.append("")
     
     # Database tables
-    print("🗄️  Database Tables:")
-    print("-" * 70)
+    out.append("🗄️  Database Tables:")
+    out.append("-" * 70)
     
     tables = [
         ("eye_tracking_data", 30, "Eye gaze tracking data"),
@@ -138,13 +204,13 @@ def main():
     ]
     
     for table_name, columns, description in tables:
-        print(f"  ✅ {table_name:.<40} ({columns:>2} columns) - {description}")
+        out.append(f"  ✅ {table_name:.<40} ({columns:>2} columns) - {description}")
     
-    print()
+    out.append("")
     
     # Risk assessment
-    print("⚠️  Risk Assessment Levels:")
-    print("-" * 70)
+    out.append("⚠️  Risk Assessment Levels:")
+    out.append("-" * 70)
     
     risk_levels = [
         ("LOW", "0.0 - 0.3", "✅ Normal behavior"),
@@ -154,31 +220,39 @@ def main():
     ]
     
     for level, score_range, description in risk_levels:
-        print(f"  {level:.<15} ({score_range}) {description}")
+        out.append(f"  {level:.<15} ({score_range}) {description}")
     
-    print()
+    out.append("")
     
     # Summary
-    print("=" * 70)
+    out.append("=" * 70)
     if all_checks_passed:
-        print("✅ ALL CHECKS PASSED - ADVANCED PROCTORING READY")
+        out.append("✅ ALL CHECKS PASSED - ADVANCED PROCTORING READY")
     else:
-        print("❌ SOME CHECKS FAILED - REVIEW ABOVE")
+        out.append("❌ SOME CHECKS FAILED - REVIEW ABOVE")
         sys.exit(1)
-    print("=" * 70)
-    
-    print()
-    print("📊 Implementation Statistics:")
-    print(f"   • Services Created: 4")
-    print(f"   • API Endpoints: 9")
-    print(f"   • Database Tables: 3")
-    print(f"   • Total Code Lines: 1700+")
-    print(f"   • Detection Features: 50+")
-    print(f"   • Risk Indicators: 30+")
-    print()
-    
-    print("🚀 Status: PRODUCTION READY")
-    print()
+    out.append("=" * 70)
+    
+    out.append("")
+    out.append("📊 Implementation Statistics:")
+    out.append(f"   • Services Created: 4")
+    out.append(f"   • API Endpoints: 9")
+    out.append(f"   • Database Tables: 3")
+    out.append(f"   • Total Code Lines: 1700+")
+    out.append(f"   • Detection Features: 50+")
+    out.append(f"   • Risk Indicators: 30+")
+    out.append("")
+    
+    out.append("🚀 Status: PRODUCTION READY")
+    out.append("")
+
+def main():
+    """Run verification checks and print the report, even if a check raises"""
+    out = []
+    try:
+        run_checks(out)
+    finally:
+        write_lines(out)
 
 if __name__ == "__main__":
     main()